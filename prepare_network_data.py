@@ -7,6 +7,7 @@ All output files are saved to the deploy/ folder for easy deployment.
 """
 
 import pandas as pd
+import gzip
 import json
 import os
 import shutil
@@ -16,66 +17,57 @@ import numpy as np
 
 # Load the data
 print("Loading data...")
-nodes = pd.read_csv("input/nodes.csv")
-edges = pd.read_csv("input/edges.csv")
+# Explicit schema: skip the unused node columns and avoid a dtype-inference pass
+# (scores stay float64 since they are written to the JSON as-is)
+nodes = pd.read_csv(
+    "input/nodes.csv",
+    usecols=["node_id", "name", "is_hub"],
+    dtype={"node_id": "int32", "is_hub": "category"},
+)
+edges = pd.read_csv(
+    "input/edges.csv",
+    usecols=["id_1", "id_2", "score", "edge_type"],
+    dtype={"id_1": "int32", "id_2": "int32", "score": "float64", "edge_type": "category"},
+)
 
 # Focus on ingredient-ingredient relationships
 ingr_ingr_edges = edges[edges["edge_type"] == "ingr-ingr"]
 
-# Merge with node information
-merged = (
-    ingr_ingr_edges
-    .merge(nodes, left_on="id_1", right_on="node_id", how="left")
-    .rename(columns={"node_type": "node_type_1", "is_hub": "is_hub_1", "name": "name_1"})
-    .drop(columns=["node_id", "id"])
-    .merge(nodes, left_on="id_2", right_on="node_id", how="left")
-    .rename(columns={"node_type": "node_type_2", "is_hub": "is_hub_2", "name": "name_2"})
-    .drop(columns=["node_id", "id"])
+# Only hub ingredients are kept, so restrict the node lookup to hubs before touching the edges
+hub_nodes = nodes[nodes["is_hub"] == "hub"]
+hub_name_by_id = dict(zip(hub_nodes["node_id"], hub_nodes["name"]))
+
+# Look up hub names for both endpoints (edges touching a non-hub node map to NaN)
+merged = ingr_ingr_edges.assign(
+    name_1=ingr_ingr_edges["id_1"].map(hub_name_by_id),
+    name_2=ingr_ingr_edges["id_2"].map(hub_name_by_id),
 )
 
-# Clean data and filter to only hub ingredients
+# Clean data: dropping unmatched endpoints leaves only edges where both ingredients are hubs
 merged_clean = merged.dropna(subset=["name_1", "name_2"]).reset_index(drop=True)
 
-# Filter to only include edges where both ingredients are hubs
-merged_clean = merged_clean[
-    (merged_clean["is_hub_1"] == "hub") & (merged_clean["is_hub_2"] == "hub")
-].reset_index(drop=True)
-
 print(f"Total ingredient pairs (hub ingredients only): {len(merged_clean)}")
 
-# Create a dictionary to store top 3 pairings for each ingredient
-# We'll store both directions (ingredient A -> B and B -> A)
-ingredient_graph = {}
-
-# Process each ingredient and get its top 3 pairings
-for _, row in merged_clean.iterrows():
-    ingr1 = row["name_1"]
-    ingr2 = row["name_2"]
-    score = row["score"]
-    
-    # Add pairing for ingredient 1
-    if ingr1 not in ingredient_graph:
-        ingredient_graph[ingr1] = []
-    ingredient_graph[ingr1].append({
-        "name": ingr2,
-        "score": float(score)
-    })
-    
-    # Add pairing for ingredient 2 (bidirectional)
-    if ingr2 not in ingredient_graph:
-        ingredient_graph[ingr2] = []
-    ingredient_graph[ingr2].append({
-        "name": ingr1,
-        "score": float(score)
-    })
+# Store both directions of every pairing (ingredient A -> B and B -> A)
+forward = merged_clean[["name_1", "name_2", "score"]].set_axis(["source", "name", "score"], axis=1)
+backward = merged_clean[["name_2", "name_1", "score"]].set_axis(["source", "name", "score"], axis=1)
+# Interleave the two directions by edge row so tied scores keep their original order
+pairings = pd.concat([forward, backward]).sort_index(kind="stable")
+# Group on categorical codes rather than hashing ingredient strings
+pairings["source"] = pairings["source"].astype("category")
 
 # Sort by score and keep only top 3 for each ingredient
 print("Filtering to top 3 pairings per ingredient...")
-filtered_graph = {}
-for ingredient, pairings in ingredient_graph.items():
-    # Sort by score (descending) and take top 3
-    sorted_pairings = sorted(pairings, key=lambda x: x["score"], reverse=True)[:3]
-    filtered_graph[ingredient] = sorted_pairings
+top_pairings = (
+    pairings
+    .sort_values("score", ascending=False, kind="stable")
+    .groupby("source", sort=False, observed=True)
+    .head(3)
+)
+filtered_graph = {
+    ingredient: group[["name", "score"]].to_dict("records")
+    for ingredient, group in top_pairings.groupby("source", sort=False, observed=True)
+}
 
 # Create a list of all unique ingredients for search
 all_ingredients = sorted(list(filtered_graph.keys()))
@@ -104,6 +96,11 @@ for category, examples in category_examples.items():
     category_text = f"{category}: {', '.join(examples[:10])}"  # Use first 10 examples
     category_embeddings[category] = model.encode(category_text, convert_to_numpy=True)
 
+# Stack category embeddings into one L2-normalized float32 matrix (one row per category)
+# so every ingredient is scored against all categories with a single matrix-vector product
+category_matrix = np.stack([category_embeddings[category] for category in categories]).astype(np.float32)
+category_matrix = np.ascontiguousarray(category_matrix / np.linalg.norm(category_matrix, axis=1, keepdims=True))
+
 # Classify each ingredient
 print(f"Classifying {len(all_ingredients)} ingredients...")
 ingredient_categories = {}
@@ -118,24 +115,24 @@ category_colors = {
     "Seafood": "#FFD93D"                     # Gold
 }
 
-for ingredient in all_ingredients:
-    # Create embedding for ingredient (replace underscores with spaces for better matching)
-    ingredient_text = ingredient.replace('_', ' ')
-    ingredient_embedding = model.encode(ingredient_text, convert_to_numpy=True)
-    
-    # Find most similar category
-    similarities = {}
-    for category, cat_embedding in category_embeddings.items():
-        similarity = np.dot(ingredient_embedding, cat_embedding) / (
-            np.linalg.norm(ingredient_embedding) * np.linalg.norm(cat_embedding)
-        )
-        similarities[category] = float(similarity)
-    
-    # Get category with highest similarity
-    best_category = max(similarities, key=similarities.get)
+# Create embeddings for all ingredients in one batch (replace underscores with spaces for better matching)
+ingredient_texts = [ingredient.replace('_', ' ') for ingredient in all_ingredients]
+ingredient_matrix = model.encode(ingredient_texts, convert_to_numpy=True).astype(np.float32, copy=False)
+ingredient_matrix /= np.sqrt(np.einsum('ij,ij->i', ingredient_matrix, ingredient_matrix))[:, None]
+
+# Cosine similarity of every ingredient to every category (both sides are normalized)
+sims = ingredient_matrix @ category_matrix.T
+
+# Get category with highest similarity for each ingredient
+best_idx = np.argmax(sims, axis=1)
+best_conf = sims[np.arange(len(all_ingredients)), best_idx]
+
+# Convert the per-ingredient results to Python ints/floats in one pass each
+for ingredient, idx, confidence in zip(all_ingredients, best_idx.tolist(), best_conf.tolist()):
+    best_category = categories[idx]
     ingredient_categories[ingredient] = {
         "category": best_category,
-        "confidence": similarities[best_category],
+        "confidence": confidence,
         "color": category_colors.get(best_category, "#95a5a6")  # Default gray
     }
 
@@ -162,13 +159,22 @@ deploy_dir = "deploy"
 os.makedirs(deploy_dir, exist_ok=True)
 
 # Save to JSON file in deploy folder (matching what HTML expects)
+# Written compactly: the file is only read by the browser, so indentation just adds bytes to download and parse
+# (json.dumps encodes in one shot with the C encoder; json.dump falls back to the pure-Python one)
 output_file = os.path.join(deploy_dir, "network_data_hub.json")
-with open(output_file, "w") as f:
-    json.dump(network_data, f, indent=2)
+network_json = json.dumps(network_data, separators=(",", ":"), ensure_ascii=False)
+with open(output_file, "w", encoding="utf-8") as f:
+    f.write(network_json)
+
+# Pre-compressed copy for clients that accept gzip (served by run_server.py)
+gzip_file = output_file + ".gz"
+with open(gzip_file, "wb") as f:
+    f.write(gzip.compress(network_json.encode("utf-8"), mtime=0))
 
 # Get file size and timestamp
 file_size = os.path.getsize(output_file)
 file_size_kb = file_size / 1024
+gzip_size_kb = os.path.getsize(gzip_file) / 1024
 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 print(f"\n{'='*60}")
@@ -178,6 +184,7 @@ print(f"✓ Filtered to hub ingredients only")
 print(f"✓ Total hub ingredients in network: {len(all_ingredients)}")
 print(f"✓ File saved to: {output_file}")
 print(f"✓ File size: {file_size_kb:.1f} KB")
+print(f"✓ Gzipped copy: {gzip_file} ({gzip_size_kb:.1f} KB)")
 print(f"✓ Updated: {timestamp}")
 print(f"{'='*60}")
 
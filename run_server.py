@@ -3,8 +3,9 @@ Simple HTTP server to run the interactive network visualization.
 Run this script and open http://localhost:8000/index.html in your browser.
 """
 
+import datetime
+import email.utils
 import http.server
-import socketserver
 import webbrowser
 import os
 
@@ -18,13 +19,54 @@ class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         super().end_headers()
 
+    def send_head(self):
+        # Serve the pre-compressed "<file>.gz" sibling when the client accepts gzip
+        path = self.translate_path(self.path)
+        gzip_path = path + ".gz"
+        if "gzip" not in self.headers.get('Accept-Encoding', '') or not os.path.isfile(gzip_path):
+            return super().send_head()
+        
+        f = open(gzip_path, 'rb')
+        fs = os.fstat(f.fileno())
+        
+        # Answer conditional requests with 304 so unchanged data isn't re-sent
+        if self.not_modified_since(fs.st_mtime):
+            f.close()
+            self.send_response(304)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return None
+        
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(fs.st_size))
+        self.send_header('Last-Modified', self.date_time_string(fs.st_mtime))
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        return f
+
+    def not_modified_since(self, mtime):
+        # Same If-Modified-Since semantics as SimpleHTTPRequestHandler.send_head
+        if 'If-Modified-Since' not in self.headers or 'If-None-Match' in self.headers:
+            return False
+        try:
+            ims = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if ims.tzinfo is None:
+            ims = ims.replace(tzinfo=datetime.timezone.utc)
+        last_modified = datetime.datetime.fromtimestamp(mtime, datetime.timezone.utc).replace(microsecond=0)
+        return last_modified <= ims
+
 def main():
     deploy_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "deploy")
     os.chdir(deploy_path)
     
     Handler = MyHTTPRequestHandler
     
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+    # Threaded so the page, its scripts and the JSON data can be served concurrently
+    with http.server.ThreadingHTTPServer(("", PORT), Handler) as httpd:
         print(f"Server running at http://localhost:{PORT}/")
         print(f"Open http://localhost:{PORT}/index.html in your browser")
         print("Press Ctrl+C to stop the server")